@@ -6,8 +6,11 @@ setup(
     packages=find_packages(),
     install_requires=[
         "requests",
+        "orjson",
         "pandas",
+        "numpy",
         "python-dotenv",
+        "cachetools",
     ],
     python_requires=">=3.7",
 )
\ No newline at end of file
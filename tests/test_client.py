@@ -0,0 +1,320 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+import requests
+
+from thread_insights_client import ThreadsInsights
+from thread_insights_client.client import _RateLimiter
+
+
+def make_response(status_code, content=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    response.url = "https://graph.threads.net/v1.0/1/insights"
+    return response
+
+
+class FetchInsightsForMediaTest(unittest.TestCase):
+    def make_client(self, delays, failing=(), **kwargs):
+        client = ThreadsInsights("id", "secret", cache_ttl=None, **kwargs)
+        lock = threading.Lock()
+        self.in_flight = self.max_in_flight = 0
+
+        def request(method, url, **kw):
+            media_id = url.split("/")[-2]
+            with lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            time.sleep(delays.get(media_id, 0.01))
+            with lock:
+                self.in_flight -= 1
+            if media_id in failing:
+                return make_response(400, b'{"error": "bad"}')
+            return make_response(200, b'{"data": [{"name": "views", "values": [{"value": 1}]}]}')
+
+        client._session.request = mock.Mock(side_effect=request)
+        return client
+
+    def test_results_keep_dataframe_order_and_skip_errors(self):
+        client = self.make_client({"3": 0.05, "1": 0.03, "2": 0.0}, failing={"1"})
+        dataframe = pd.DataFrame({"id": ["3", "1", "2"]})
+
+        insights = client.fetch_insights_for_media_in_dataframe("token", dataframe, ["views"])
+
+        self.assertEqual([item["media_id"] for item in insights], ["3", "2"])
+
+    def test_max_concurrency_is_honoured(self):
+        client = self.make_client({}, max_concurrency=2)
+        dataframe = pd.DataFrame({"id": [str(i) for i in range(8)]})
+
+        insights = client.fetch_insights_for_media_in_dataframe("token", dataframe, ["views"])
+
+        self.assertEqual(len(insights), 8)
+        self.assertEqual(self.max_in_flight, 2)
+
+    def test_rate_limit_is_applied_per_request(self):
+        client = self.make_client({}, rate_limit=5)
+        dataframe = pd.DataFrame({"id": ["1", "2", "3"]})
+
+        with mock.patch.object(client._rate_limiter, "acquire") as acquire:
+            client.fetch_insights_for_media_in_dataframe("token", dataframe, ["views"])
+
+        self.assertEqual(acquire.call_count, 3)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_calls_are_spaced_across_the_period(self):
+        limiter = _RateLimiter(rate=4, period=1.0)
+        with mock.patch("thread_insights_client.client.time.monotonic", return_value=100.0), \
+                mock.patch("thread_insights_client.client.time.sleep") as sleep:
+            for _ in range(3):
+                limiter.acquire()
+
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.25, 0.5])
+
+    def test_idle_limiter_does_not_wait(self):
+        limiter = _RateLimiter(rate=4, period=1.0)
+        with mock.patch("thread_insights_client.client.time.monotonic", side_effect=[100.0, 200.0]), \
+                mock.patch("thread_insights_client.client.time.sleep") as sleep:
+            limiter.acquire()
+            limiter.acquire()
+
+        sleep.assert_not_called()
+
+
+class MediaInsightsCacheTest(unittest.TestCase):
+    PAYLOAD = b'{"data": [{"name": "views", "values": [{"value": 5}]}]}'
+
+    def make_client(self, **kwargs):
+        client = ThreadsInsights("id", "secret", **kwargs)
+        client._session.request = mock.Mock(
+            return_value=make_response(200, self.PAYLOAD, {"ETag": "etag-1"})
+        )
+        return client
+
+    def test_cache_hit_skips_network(self):
+        client = self.make_client()
+        first = client.get_media_insights("token", "1", ["views", "likes"])
+        second = client.get_media_insights("token", "1", ["likes", "views"])
+
+        self.assertEqual(first, second)
+        self.assertEqual(client._session.request.call_count, 1)
+
+    def test_cached_results_are_independent_copies(self):
+        client = self.make_client()
+        first = client.get_media_insights("token", "1", ["views"])
+        first["data"].clear()
+
+        second = client.get_media_insights("token", "1", ["views"])
+        self.assertEqual(second["data"][0]["values"][0]["value"], 5)
+
+    def test_cache_key_includes_token(self):
+        client = self.make_client()
+        client.get_media_insights("token-a", "1", ["views"])
+        client.get_media_insights("token-b", "1", ["views"])
+
+        self.assertEqual(client._session.request.call_count, 2)
+
+    def test_expired_entry_is_revalidated_with_etag(self):
+        client = self.make_client()
+        client.get_media_insights("token", "1", ["views"])
+        client._media_insights_cache.clear()
+
+        client._session.request.return_value = make_response(304)
+        insights = client.get_media_insights("token", "1", ["views"])
+
+        headers = client._session.request.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], "etag-1")
+        self.assertEqual(insights["data"][0]["values"][0]["value"], 5)
+
+    def test_errors_are_not_cached(self):
+        client = self.make_client()
+        client._session.request.return_value = make_response(400, b'{"error": "bad"}')
+        error = client.get_media_insights("token", "1", ["views"])
+
+        self.assertEqual(error["error"]["code"], "MEDIA_INSIGHTS_FAILED")
+        self.assertEqual(len(client._media_insights_cache), 0)
+
+    def test_disabled_cache_always_fetches_without_etags(self):
+        client = self.make_client(cache_ttl=None)
+        client.get_media_insights("token", "1", ["views"])
+        client.get_media_insights("token", "1", ["views"])
+
+        self.assertEqual(client._session.request.call_count, 2)
+        self.assertIsNone(client._media_insights_etags)
+        headers = client._session.request.call_args.kwargs["headers"]
+        self.assertNotIn("If-None-Match", headers)
+
+    def test_concurrent_fetches_share_the_cache(self):
+        client = self.make_client()
+        results = []
+
+        def fetch():
+            results.append(client.get_media_insights("token", "1", ["views"]))
+
+        threads = [threading.Thread(target=fetch) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 16)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(len(client._media_insights_cache), 1)
+
+
+class ConvertAccountInsightsTest(unittest.TestCase):
+    def test_optional_columns_follow_first_appearance(self):
+        response = {"data": [
+            {
+                "name": "follower_demographics",
+                "total_value": {"breakdowns": [{
+                    "dimension_keys": ["country"],
+                    "results": [{"dimension_values": ["US"], "value": 5}]
+                }]}
+            },
+            {"name": "likes", "values": [{"value": 9, "end_time": "2024-01-01"}]},
+        ]}
+        df = ThreadsInsights("id", "secret").convert_account_insights_to_dataframe(response)
+
+        self.assertEqual(list(df.columns), [
+            "name", "title", "description", "since", "until", "total_value", "id",
+            "dimension_key", "dimension_value", "value", "end_time"
+        ])
+        self.assertEqual(df["value"].tolist(), [5, 9])
+
+
+class RequestErrorTest(unittest.TestCase):
+    CALLS = {
+        "TOKEN_EXCHANGE_FAILED": lambda c: c.exchange_code_for_token("https://example.com/cb?code=abc"),
+        "LONG_TOKEN_EXCHANGE_FAILED": lambda c: c.get_long_lived_token("short"),
+        "INSIGHTS_FETCH_FAILED": lambda c: c.get_threads_user_insights("token", ["likes"]),
+        "MEDIA_INSIGHTS_FAILED": lambda c: c.get_media_insights("token", "1", ["views"]),
+        "THREADS_FETCH_FAILED": lambda c: c.get_list_user_threads("token", ["id"]),
+    }
+
+    def make_client(self, **request_kwargs):
+        client = ThreadsInsights("id", "secret")
+        client._session.request = mock.Mock(**request_kwargs)
+        return client
+
+    def test_http_errors_return_raw_body_under_method_code(self):
+        for code, call in self.CALLS.items():
+            with self.subTest(code=code):
+                client = self.make_client(return_value=make_response(400, b'{"error": "bad request"}'))
+                self.assertEqual(
+                    call(client),
+                    {"error": {"message": '{"error": "bad request"}', "code": code}}
+                )
+
+    def test_http_error_body_is_truncated(self):
+        client = self.make_client(return_value=make_response(500, b"x" * 5000))
+        error = client.get_list_user_threads("token", ["id"])
+
+        self.assertEqual(len(error["error"]["message"]), 1000)
+
+    def test_connection_errors_map_to_request_failed(self):
+        for code, call in self.CALLS.items():
+            with self.subTest(code=code):
+                client = self.make_client(side_effect=requests.exceptions.ConnectionError("down"))
+                error = call(client)
+                self.assertEqual(error["error"]["code"], "REQUEST_FAILED")
+                self.assertIn("down", error["error"]["message"])
+
+    def test_non_json_success_body_maps_to_request_failed(self):
+        client = self.make_client(return_value=make_response(200, b"<html>"))
+        error = client.get_threads_user_insights("token", ["likes"])
+
+        self.assertEqual(error["error"]["code"], "REQUEST_FAILED")
+
+
+class IterAllThreadsTest(unittest.TestCase):
+    def make_client(self, second_page):
+        client = ThreadsInsights("id", "secret")
+
+        def request(method, url, params=None, **kwargs):
+            if "after" not in params:
+                return make_response(
+                    200, b'{"data": [{"id": "1"}, {"id": "2"}], "paging": {"cursors": {"after": "c2"}}}'
+                )
+            return second_page
+
+        client._session.request = mock.Mock(side_effect=request)
+        return client
+
+    def test_follows_cursor_across_pages(self):
+        client = self.make_client(make_response(200, b'{"data": [{"id": "3"}], "paging": {"cursors": {}}}'))
+
+        threads = list(client.iter_all_threads("token", ["id"]))
+
+        self.assertEqual([thread["id"] for thread in threads], ["1", "2", "3"])
+        self.assertEqual(client._session.request.call_count, 2)
+        self.assertEqual(client._session.request.call_args.kwargs["params"]["after"], "c2")
+
+    def test_error_page_stops_after_yielding_earlier_pages(self):
+        client = self.make_client(make_response(500, b"server error"))
+
+        threads = list(client.iter_all_threads("token", ["id"]))
+
+        self.assertEqual([thread["id"] for thread in threads], ["1", "2"])
+        self.assertEqual(client._session.request.call_count, 2)
+
+    def test_fetch_all_threads_wraps_the_generator(self):
+        client = self.make_client(make_response(200, b'{"data": [{"id": "3"}]}'))
+
+        threads = client.fetch_all_threads_with_pagination("token", ["id"])
+
+        self.assertEqual([thread["id"] for thread in threads], ["1", "2", "3"])
+
+
+class FetchAndMergeTest(unittest.TestCase):
+    def test_duplicate_ids_are_fetched_once_and_not_multiplied(self):
+        client = ThreadsInsights("id", "secret", cache_ttl=None)
+
+        def request(method, url, **kwargs):
+            if url.endswith("/me/threads"):
+                return make_response(200, b'{"data": [{"id": "1"}, {"id": "1"}, {"id": "2"}]}')
+            media_id = url.split("/")[-2]
+            return make_response(
+                200, b'{"data": [{"name": "views", "values": [{"value": %s}]}]}' % media_id.encode()
+            )
+
+        client._session.request = mock.Mock(side_effect=request)
+        df = client.fetch_and_merge_threads_with_insights("token", ["id"], ["views"], "acme")
+
+        insights_urls = [
+            c.args[1] for c in client._session.request.call_args_list if c.args[1].endswith("/insights")
+        ]
+        self.assertEqual(sorted(insights_urls), [
+            "https://graph.threads.net/v1.0/1/insights",
+            "https://graph.threads.net/v1.0/2/insights",
+        ])
+        self.assertEqual(len(df), 3)
+        self.assertEqual(list(df.index), [0, 1, 2])
+        self.assertEqual(df["views"].tolist(), [1, 1, 2])
+
+
+class ThreadsJsonToDataFrameTest(unittest.TestCase):
+    def test_columns_are_built_with_explicit_dtypes(self):
+        threads = iter([
+            {"id": "1", "owner": {"id": "9"}, "timestamp": "2024-05-01T12:00:00+0000",
+             "is_quote_post": True, "children": {"data": [{"id": "c1"}]}},
+            {"id": "2", "timestamp": "not a timestamp"},
+        ])
+        df = ThreadsInsights("id", "secret").threads_json_to_dataframe(threads)
+
+        self.assertEqual(str(df["id"].dtype), "string")
+        self.assertEqual(str(df["is_quote_post"].dtype), "boolean")
+        self.assertEqual(str(df["timestamp"].dt.tz), "UTC")
+        self.assertEqual(df["owner_id"].tolist()[0], "9")
+        self.assertTrue(pd.isna(df["timestamp"][1]))
+        self.assertEqual(df["children_ids"].tolist(), [["c1"], None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,94 @@
 import os
-import re
-import json
+import sys
+import time
+import threading
+import orjson
 import requests
+import numpy as np
 import pandas as pd
 
-from typing import Optional, Dict, Any, List, Union
-from datetime import datetime, timedelta, timezone
+from cachetools import LRUCache, TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from typing import Optional, Dict, Any, List, Union, Iterable, Iterator
+from datetime import datetime, timezone
 from urllib.parse import urlparse, parse_qs
 from dotenv import load_dotenv
 
+_SECONDS_PER_DAY = 86400
+
+# Set once the first client has loaded .env
+_DOTENV_LOADED = False
+
+# Valid request values, validated by set membership
+_USER_INSIGHT_METRICS = frozenset({
+    "likes", "replies", "followers_count", "follower_demographics",
+    "reposts", "views", "quotes"
+})
+_USER_INSIGHT_METRICS_STR = ", ".join(sorted(_USER_INSIGHT_METRICS))
+
+_USER_INSIGHT_BREAKDOWNS = frozenset({"country", "city", "age", "gender"})
+
+_MEDIA_INSIGHT_METRICS = frozenset({"views", "likes", "replies", "reposts", "quotes", "shares"})
+_MEDIA_INSIGHT_METRICS_STR = ", ".join(sorted(_MEDIA_INSIGHT_METRICS))
+
+_THREAD_FIELDS = frozenset({
+    "id", "media_product_type", "media_type", "media_url", "permalink", "owner",
+    "username", "text", "timestamp", "shortcode", "thumbnail_url", "children",
+    "is_quote_post", "quoted_post", "reposted_post", "has_replies", "alt_text",
+    "link_attachment_url"
+})
+_THREAD_FIELDS_STR = ", ".join(sorted(_THREAD_FIELDS))
+
+# Format of thread timestamps returned by the API, e.g. 2024-05-01T12:00:00+0000
+_THREAD_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+# Column dtypes of the DataFrame built by threads_json_to_dataframe
+_THREAD_COLUMN_DTYPES = {
+    "id": "string",
+    "media_product_type": "string",
+    "media_type": "string",
+    "media_url": "string",
+    "permalink": "string",
+    "owner_id": "string",
+    "username": "string",
+    "text": "string",
+    "timestamp": object,  # parsed with pd.to_datetime
+    "shortcode": "string",
+    "is_quote_post": "boolean",
+    "has_replies": "boolean",
+    "children_ids": object,
+}
+
+# Thread fields consumed by threads_json_to_dataframe
+_DATAFRAME_FIELDS = (
+    "id", "media_product_type", "media_type", "media_url", "permalink", "owner",
+    "username", "text", "timestamp", "shortcode", "is_quote_post", "has_replies",
+    "children"
+)
+
+class _RateLimiter:
+    """
+    Thread-safe limiter allowing at most `rate` calls per `period` seconds,
+    spacing calls evenly across the period.
+    """
+
+    def __init__(self, rate: int, period: float = 1.0):
+        self._interval = period / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
 class ThreadsInsights:
     """
     A client for interacting with the Threads API:
@@ -21,14 +101,27 @@ class ThreadsInsights:
         self,
         client_id: Optional[str] = None,
         client_secret: Optional[str] = None,
-        redirect_uri: Optional[str] = None
+        redirect_uri: Optional[str] = None,
+        max_concurrency: int = 8,
+        rate_limit: Optional[int] = None,
+        rate_period: float = 1.0,
+        cache_ttl: Optional[float] = 300
     ):
         """
-        Initialize the ThreadsClient, loading .env if available.
+        Initialize the ThreadsClient, loading .env (once per process) if available.
         If client_id or client_secret are not provided, the client
         will attempt to read them from environment variables.
+
+        max_concurrency caps the number of parallel media insights requests.
+        If rate_limit is given, at most rate_limit of those requests are
+        started per rate_period seconds.
+        Media insights are cached for cache_ttl seconds and then revalidated by ETag
+        (None or 0 disables both).
         """
-        load_dotenv()
+        global _DOTENV_LOADED
+        if not _DOTENV_LOADED:
+            load_dotenv()
+            _DOTENV_LOADED = True
 
         self.client_id = client_id or os.getenv("CLIENT_ID")
         self.client_secret = client_secret or os.getenv("CLIENT_SECRET")
@@ -39,6 +132,35 @@ class ThreadsInsights:
         self.short_lived_token = None
         self.long_lived_token = None
 
+        self.max_concurrency = max_concurrency
+        self._rate_limiter = _RateLimiter(rate_limit, rate_period) if rate_limit else None
+
+        # Media insights cache and ETags for conditional re-fetches; both hold the raw
+        # response bytes so every caller gets its own freshly decoded dict
+        self._media_insights_cache = TTLCache(maxsize=2048, ttl=cache_ttl) if cache_ttl else None
+        self._media_insights_etags = LRUCache(maxsize=2048) if cache_ttl else None
+        self._cache_lock = threading.Lock()
+
+        # Reuse connections to graph.threads.net across calls (keep-alive)
+        self._session = requests.Session()
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False
+        )
+        # Keep at least one pooled connection per worker so parallel fetches never
+        # open (and then discard) extra TLS connections beyond the pool size
+        self._session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=max(32, max_concurrency),
+                pool_block=True,
+                max_retries=retries
+            )
+        )
+
     # ---------------------
     # Private helper to build error
     # ---------------------
@@ -48,6 +170,26 @@ class ThreadsInsights:
             error_dict["error"]["code"] = code
         return error_dict
 
+    # ---------------------
+    # Private helpers to send requests
+    # ---------------------
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        response = self._session.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def _request_error(self, exc: Exception, code: str) -> Dict[str, Any]:
+        # HTTP errors keep the raw body text instead of parsing it
+        if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+            return self._build_error(exc.response.text[:1000], code=code)
+        return self._build_error(f"Request failed: {exc}", code="REQUEST_FAILED")
+
+    def _request(self, method: str, url: str, code: str, **kwargs: Any) -> Dict[str, Any]:
+        try:
+            return orjson.loads(self._send(method, url, **kwargs).content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            return self._request_error(e, code)
+
     # ---------------------
     # 1) Exchange Code for Token
     # ---------------------
@@ -73,24 +215,19 @@ class ThreadsInsights:
             "redirect_uri": self.redirect_uri,
         }
 
-        try:
-            response = requests.post("https://graph.threads.net/oauth/access_token", data=data)
-            if response.status_code == 200:
-                token_info = response.json()
-                self.short_lived_token = token_info.get("access_token")
-                return {
-                    "short_lived_token": self.short_lived_token,
-                    "token_type": token_info.get("token_type"),
-                    "expires_in": token_info.get("expires_in"),
-                    "error": None
-                }
-            else:
-                return self._build_error(
-                    message=str(response.json()),
-                    code="TOKEN_EXCHANGE_FAILED"
-                )
-        except requests.exceptions.RequestException as e:
-            return self._build_error(f"Request failed: {e}", code="REQUEST_FAILED")
+        token_info = self._request(
+            "POST", "https://graph.threads.net/oauth/access_token", "TOKEN_EXCHANGE_FAILED", data=data
+        )
+        if "error" in token_info:
+            return token_info
+
+        self.short_lived_token = token_info.get("access_token")
+        return {
+            "short_lived_token": self.short_lived_token,
+            "token_type": token_info.get("token_type"),
+            "expires_in": token_info.get("expires_in"),
+            "error": None
+        }
 
     # ---------------------
     # 2) Get Long-Lived Token
@@ -112,22 +249,17 @@ class ThreadsInsights:
             "access_token": token_to_use,
         }
 
-        try:
-            resp = requests.get("https://graph.threads.net/access_token", params=params)
-            if resp.status_code == 200:
-                info = resp.json()
-                self.long_lived_token = info.get("access_token")
-                return {
-                    "long_lived_token": self.long_lived_token,
-                    "error": None
-                }
-            else:
-                return self._build_error(
-                    message=str(resp.json()),
-                    code="LONG_TOKEN_EXCHANGE_FAILED"
-                )
-        except requests.exceptions.RequestException as e:
-            return self._build_error(f"Request failed: {e}", code="REQUEST_FAILED")
+        info = self._request(
+            "GET", "https://graph.threads.net/access_token", "LONG_TOKEN_EXCHANGE_FAILED", params=params
+        )
+        if "error" in info:
+            return info
+
+        self.long_lived_token = info.get("access_token")
+        return {
+            "long_lived_token": self.long_lived_token,
+            "error": None
+        }
 
     # ---------------------
     # 3) Get Threads User Insights
@@ -143,16 +275,13 @@ class ThreadsInsights:
         """
         Fetch Threads user insights.
         """
-        VALID_METRICS = [
-            "likes", "replies", "followers_count", "follower_demographics",
-            "reposts", "views", "quotes"
-        ]
-        invalid_metrics = [m for m in metrics if m not in VALID_METRICS]
+        invalid_metrics = set(metrics) - _USER_INSIGHT_METRICS
         if invalid_metrics:
             return self._build_error(
-                f"Invalid metric(s): {', '.join(invalid_metrics)}. Valid metrics: {', '.join(VALID_METRICS)}",
+                f"Invalid metric(s): {', '.join(sorted(invalid_metrics))}. Valid metrics: {_USER_INSIGHT_METRICS_STR}",
                 code="INVALID_INPUT"
             )
+        metrics = list(dict.fromkeys(metrics))
 
         params = {"metric": ",".join(metrics)}
         if since:
@@ -160,7 +289,7 @@ class ThreadsInsights:
         if until:
             params["until"] = until
         if breakdown:
-            if breakdown not in ["country", "city", "age", "gender"]:
+            if breakdown not in _USER_INSIGHT_BREAKDOWNS:
                 return self._build_error(
                     "Invalid breakdown value. Must be 'country', 'city', 'age', or 'gender'.",
                     code="INVALID_INPUT"
@@ -169,14 +298,10 @@ class ThreadsInsights:
 
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        try:
-            response = requests.get("https://graph.threads.net/me/threads_insights", params=params, headers=headers)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return self._build_error(str(response.json()), code="INSIGHTS_FETCH_FAILED")
-        except requests.exceptions.RequestException as e:
-            return self._build_error(f"Request failed: {e}", code="REQUEST_FAILED")
+        return self._request(
+            "GET", "https://graph.threads.net/me/threads_insights", "INSIGHTS_FETCH_FAILED",
+            params=params, headers=headers
+        )
 
     # ---------------------
     # 4) Get Media Insights
@@ -189,27 +314,48 @@ class ThreadsInsights:
     ) -> Dict[str, Any]:
         """
         Fetch insights for a specific media.
+        Successful responses are cached for cache_ttl seconds and revalidated with their ETag.
         """
-        VALID_METRICS = ["views", "likes", "replies", "reposts", "quotes", "shares"]
-        invalid_metrics = [m for m in metrics if m not in VALID_METRICS]
+        invalid_metrics = set(metrics) - _MEDIA_INSIGHT_METRICS
         if invalid_metrics:
             return self._build_error(
-                f"Invalid metric(s): {', '.join(invalid_metrics)}. Valid metrics: {', '.join(VALID_METRICS)}",
+                f"Invalid metric(s): {', '.join(sorted(invalid_metrics))}. Valid metrics: {_MEDIA_INSIGHT_METRICS_STR}",
                 code="INVALID_INPUT"
             )
+        metrics = list(dict.fromkeys(metrics))
+
+        cache_key = (access_token, media_id, tuple(sorted(metrics)))
+        etag_entry = None
+        if self._media_insights_cache is not None:
+            with self._cache_lock:
+                cached = self._media_insights_cache.get(cache_key)
+                etag_entry = self._media_insights_etags.get(cache_key)
+            if cached is not None:
+                return orjson.loads(cached)
 
         url = f"https://graph.threads.net/v1.0/{media_id}/insights"
         params = {"metric": ",".join(metrics)}
         headers = {"Authorization": f"Bearer {access_token}"}
+        if etag_entry:
+            headers["If-None-Match"] = etag_entry[0]
 
         try:
-            response = requests.get(url, params=params, headers=headers)
-            if response.status_code == 200:
-                return response.json()
+            response = self._send("GET", url, params=params, headers=headers)
+            if response.status_code == 304 and etag_entry:
+                etag, content = etag_entry
             else:
-                return self._build_error(str(response.json()), code="MEDIA_INSIGHTS_FAILED")
-        except requests.exceptions.RequestException as e:
-            return self._build_error(f"Request failed: {e}", code="REQUEST_FAILED")
+                content = response.content
+                etag = response.headers.get("ETag")
+            insights = orjson.loads(content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            return self._request_error(e, "MEDIA_INSIGHTS_FAILED")
+
+        if self._media_insights_cache is not None:
+            with self._cache_lock:
+                self._media_insights_cache[cache_key] = content
+                if etag:
+                    self._media_insights_etags[cache_key] = (etag, content)
+        return insights
 
     # ---------------------
     # 5) Pretty Print JSON
@@ -218,7 +364,15 @@ class ThreadsInsights:
         """
         Print JSON data in a human-readable format.
         """
-        print(json.dumps(data, indent=4))
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        buffer = getattr(sys.stdout, "buffer", None)
+        if buffer is None:
+            # e.g. notebook streams that only accept text
+            sys.stdout.write(payload.decode())
+            return
+        sys.stdout.flush()
+        buffer.write(payload)
+        buffer.flush()
 
     # ---------------------
     # 6) Get List User Threads
@@ -236,18 +390,13 @@ class ThreadsInsights:
         """
         Fetch user threads with support for field selection and pagination.
         """
-        VALID_FIELDS = [
-            "id", "media_product_type", "media_type", "media_url", "permalink", "owner",
-            "username", "text", "timestamp", "shortcode", "thumbnail_url", "children",
-            "is_quote_post", "quoted_post", "reposted_post", "has_replies", "alt_text",
-            "link_attachment_url"
-        ]
-        invalid_fields = [f for f in fields if f not in VALID_FIELDS]
+        invalid_fields = set(fields) - _THREAD_FIELDS
         if invalid_fields:
             return self._build_error(
-                f"Invalid field(s): {', '.join(invalid_fields)}. Valid fields: {', '.join(VALID_FIELDS)}",
+                f"Invalid field(s): {', '.join(sorted(invalid_fields))}. Valid fields: {_THREAD_FIELDS_STR}",
                 code="INVALID_INPUT"
             )
+        fields = list(dict.fromkeys(fields))
 
         params = {
             "fields": ",".join(fields)
@@ -265,34 +414,29 @@ class ThreadsInsights:
 
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        try:
-            response = requests.get("https://graph.threads.net/me/threads", params=params, headers=headers)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return self._build_error(str(response.json()), code="THREADS_FETCH_FAILED")
-        except requests.exceptions.RequestException as e:
-            return self._build_error(f"Request failed: {e}", code="REQUEST_FAILED")
+        return self._request(
+            "GET", "https://graph.threads.net/me/threads", "THREADS_FETCH_FAILED",
+            params=params, headers=headers
+        )
 
     # ---------------------
     # 7) Fetch All Threads with Pagination
     # ---------------------
-    def fetch_all_threads_with_pagination(
+    def iter_all_threads(
         self,
         access_token: str,
         fields: List[str],
         since: Optional[int] = None,
         until: Optional[int] = None,
-        limit: int = 50
-    ) -> List[Any]:
+        limit: int = 100
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Fetch all user threads with pagination using the 'after' cursor.
+        Lazily yield all user threads, following the 'after' cursor page by page.
+        The next page is requested in the background while the current one is consumed.
+        Each page costs a round trip, so keep limit high and request only the fields you need.
         """
-        all_threads = []
-        after_cursor = None
-
-        while True:
-            response = self.get_list_user_threads(
+        def fetch_page(after_cursor: Optional[str]) -> Dict[str, Any]:
+            return self.get_list_user_threads(
                 access_token=access_token,
                 fields=fields,
                 since=since,
@@ -301,20 +445,34 @@ class ThreadsInsights:
                 after=after_cursor
             )
 
-            if "error" in response:
-                print(f"Error in fetch_all_threads_with_pagination: {response['error']}")
-                break
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(fetch_page, None)
+            while future:
+                response = future.result()
 
-            data_list = response.get("data", [])
-            all_threads.extend(data_list)
+                if "error" in response:
+                    print(f"Error in iter_all_threads: {response['error']}")
+                    break
 
-            paging = response.get("paging", {})
-            after_cursor = paging.get("cursors", {}).get("after")
-            
-            if not after_cursor:
-                break
+                paging = response.get("paging", {})
+                after_cursor = paging.get("cursors", {}).get("after")
+                future = executor.submit(fetch_page, after_cursor) if after_cursor else None
 
-        return all_threads
+                yield from response.get("data", [])
+
+    def fetch_all_threads_with_pagination(
+        self,
+        access_token: str,
+        fields: List[str],
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: int = 100
+    ) -> List[Any]:
+        """
+        Fetch all user threads with pagination using the 'after' cursor.
+        Prefer iter_all_threads to avoid holding every page in memory.
+        """
+        return list(self.iter_all_threads(access_token, fields, since, until, limit))
 
     # ---------------------
     # 8) Convert Account Insights to DataFrame
@@ -327,68 +485,103 @@ class ThreadsInsights:
             return pd.DataFrame()
 
         data = response["data"]
-        rows = []
 
         since_val, until_val = None, None
         # Example: handle 'paging' to parse since/until from URLs
         if "paging" in response and "previous" in response["paging"]:
             prev_url = response["paging"]["previous"]
-            since_match = re.search(r"since=(\d+)", prev_url)
-            until_match = re.search(r"until=(\d+)", prev_url)
-            if since_match:
-                since_ts = int(since_match.group(1))
+            query_params = parse_qs(urlparse(prev_url).query)
+            since_param = query_params.get("since", [None])[0]
+            until_param = query_params.get("until", [None])[0]
+            if since_param and since_param.isdigit():
+                since_ts = int(since_param)
                 since_val = datetime.fromtimestamp(since_ts, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
-            if until_match:
-                until_ts = int(until_match.group(1))
+            if until_param and until_param.isdigit():
+                until_ts = int(until_param)
                 until_val = datetime.fromtimestamp(until_ts, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
 
+        # Build the frame column-wise instead of copying a dict per row; fields a row
+        # would not have had are NaN, as pandas fills them for missing dict keys
+        names, titles, descriptions, total_values, ids = [], [], [], [], []
+        values, end_times, dimension_keys, dimension_values = [], [], [], []
+        # Optional columns, kept in the order they first appear (like a list-of-dicts frame)
+        optional_columns = {}
+
         for item in data:
-            base_row = {
-                "name": item.get("name"),
-                "title": item.get("title"),
-                "description": item.get("description"),
-                "since": since_val,
-                "until": until_val,
-                "total_value": item.get("total_value", {}).get("value", None),
-                "id": item.get("id"),
-            }
+            name = item.get("name")
+            total_value = item.get("total_value", {}).get("value", None)
+            start = len(total_values)
 
             # Handle demographics
-            if item.get("name") == "follower_demographics" and "total_value" in item:
+            if name == "follower_demographics" and "total_value" in item:
                 breakdowns = item["total_value"].get("breakdowns", [])
                 for breakdown in breakdowns:
                     dimension_key = ",".join(breakdown.get("dimension_keys", []))
                     for result in breakdown.get("results", []):
-                        row_copy = base_row.copy()
-                        row_copy.update({
-                            "dimension_key": dimension_key,
-                            "dimension_value": result.get("dimension_values", [None])[0],
-                            "value": result.get("value"),
-                        })
-                        rows.append(row_copy)
-            elif item.get("name") == "views" and "values" in item:
+                        total_values.append(total_value)
+                        values.append(result.get("value"))
+                        end_times.append(np.nan)
+                        dimension_keys.append(dimension_key)
+                        dimension_values.append(result.get("dimension_values", [None])[0])
+                row_keys = ("dimension_key", "dimension_value", "value")
+            elif name == "views" and "values" in item:
                 # Aggregate total views
-                total_views = sum(v.get("value", 0) for v in item["values"])
-                row_copy = base_row.copy()
-                row_copy.update({
-                    "total_value": total_views,
-                    "value": None,
-                    "end_time": None,
-                })
-                rows.append(row_copy)
+                total_views = np.fromiter(
+                    (v.get("value", 0) for v in item["values"]), dtype=np.int64
+                ).sum()
+                total_values.append(int(total_views))
+                values.append(None)
+                end_times.append(None)
+                dimension_keys.append(np.nan)
+                dimension_values.append(np.nan)
+                row_keys = ("value", "end_time")
             elif "values" in item:
                 # Metrics with time-series values
                 for value_item in item["values"]:
-                    row_copy = base_row.copy()
-                    row_copy.update({
-                        "value": value_item.get("value"),
-                        "end_time": value_item.get("end_time"),
-                    })
-                    rows.append(row_copy)
+                    total_values.append(total_value)
+                    values.append(value_item.get("value"))
+                    end_times.append(value_item.get("end_time"))
+                    dimension_keys.append(np.nan)
+                    dimension_values.append(np.nan)
+                row_keys = ("value", "end_time")
             else:
-                rows.append(base_row)
+                total_values.append(total_value)
+                values.append(np.nan)
+                end_times.append(np.nan)
+                dimension_keys.append(np.nan)
+                dimension_values.append(np.nan)
+                row_keys = ()
+
+            count = len(total_values) - start
+            if count:
+                optional_columns.update(dict.fromkeys(row_keys))
+            names.extend([name] * count)
+            titles.extend([item.get("title")] * count)
+            descriptions.extend([item.get("description")] * count)
+            ids.extend([item.get("id")] * count)
+
+        if not names:
+            return pd.DataFrame()
+
+        columns = {
+            "name": names,
+            "title": titles,
+            "description": descriptions,
+            "since": [since_val] * len(names),
+            "until": [until_val] * len(names),
+            "total_value": total_values,
+            "id": ids,
+        }
+        optional_values = {
+            "value": values,
+            "end_time": end_times,
+            "dimension_key": dimension_keys,
+            "dimension_value": dimension_values,
+        }
+        for column in optional_columns:
+            columns[column] = optional_values[column]
 
-        return pd.DataFrame(rows)
+        return pd.DataFrame(columns)
 
     # ---------------------
     # 9) Get Unix Time Frames
@@ -397,76 +590,69 @@ class ThreadsInsights:
         """
         Return multiple Unix timestamp ranges for time-based queries.
         """
-        now = datetime.now(timezone.utc)
+        # UTC days are aligned to the epoch, so every boundary is plain integer math
+        now_ts = int(time.time())
+        today_start = now_ts - now_ts % _SECONDS_PER_DAY
+        weekday = (now_ts // _SECONDS_PER_DAY + 3) % 7  # 1970-01-01 was a Thursday
 
         # Current week (Monday - Sunday)
-        current_week_start = now - timedelta(days=now.weekday())
-        current_week_start = current_week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-        current_week_end = current_week_start + timedelta(days=6, hours=23, minutes=59, seconds=59)
+        current_week_start = today_start - weekday * _SECONDS_PER_DAY
+        current_week_end = current_week_start + 7 * _SECONDS_PER_DAY - 1
 
         # Last week (Monday - Sunday)
-        last_week_start = current_week_start - timedelta(days=7)
-        last_week_end = last_week_start + timedelta(days=6, hours=23, minutes=59, seconds=59)
-
-        # Rolling 7 days
-        rolling_7_days_start = now - timedelta(days=7)
-        rolling_7_days_end = now
-
-        # Rolling 90 days
-        rolling_90_days_start = now - timedelta(days=90)
-        rolling_90_days_end = now
+        last_week_start = current_week_start - 7 * _SECONDS_PER_DAY
+        last_week_end = current_week_start - 1
 
         return {
             "last_week": {
-                "start": int(last_week_start.timestamp()),
-                "end": int(last_week_end.timestamp())
+                "start": last_week_start,
+                "end": last_week_end
             },
             "current_week": {
-                "start": int(current_week_start.timestamp()),
-                "end": int(current_week_end.timestamp())
+                "start": current_week_start,
+                "end": current_week_end
             },
             "rolling_7_days": {
-                "start": int(rolling_7_days_start.timestamp()),
-                "end": int(rolling_7_days_end.timestamp())
+                "start": now_ts - 7 * _SECONDS_PER_DAY,
+                "end": now_ts
             },
             "rolling_90_days": {
-                "start": int(rolling_90_days_start.timestamp()),
-                "end": int(rolling_90_days_end.timestamp())
+                "start": now_ts - 90 * _SECONDS_PER_DAY,
+                "end": now_ts
             }
         }
 
     # ---------------------
     # 10) Threads JSON to DataFrame
     # ---------------------
-    def threads_json_to_dataframe(self, threads_json: List[Dict[str, Any]]) -> pd.DataFrame:
+    def threads_json_to_dataframe(self, threads_json: Iterable[Dict[str, Any]]) -> pd.DataFrame:
         """
-        Converts a list of thread JSON objects into a Pandas DataFrame.
+        Converts thread JSON objects (any iterable, e.g. iter_all_threads) into a Pandas DataFrame.
         """
-        rows = []
+        # Fill the column lists as threads stream in, so the raw dicts are never all held at once
+        columns = {column: [] for column in _THREAD_COLUMN_DTYPES}
+        plain_columns = [c for c in _THREAD_COLUMN_DTYPES if c not in ("owner_id", "children_ids")]
         for thread in threads_json:
-            row = {
-                "id": thread.get("id"),
-                "media_product_type": thread.get("media_product_type"),
-                "media_type": thread.get("media_type"),
-                "media_url": thread.get("media_url"),
-                "permalink": thread.get("permalink"),
-                "owner_id": thread.get("owner", {}).get("id"),
-                "username": thread.get("username"),
-                "text": thread.get("text"),
-                "timestamp": thread.get("timestamp"),
-                "shortcode": thread.get("shortcode"),
-                "is_quote_post": thread.get("is_quote_post"),
-                "has_replies": thread.get("has_replies"),
-            }
+            for column in plain_columns:
+                columns[column].append(thread.get(column))
+            columns["owner_id"].append(thread.get("owner", {}).get("id"))
             children = thread.get("children", {}).get("data", [])
-            if children:
-                row["children_ids"] = [child.get("id") for child in children]
-            else:
-                row["children_ids"] = None
-            rows.append(row)
+            columns["children_ids"].append([child.get("id") for child in children] if children else None)
 
-        print(f"Converted {len(rows)} threads to DataFrame.")
-        return pd.DataFrame(rows)
+        count = len(columns["id"])
+        print(f"Converted {count} threads to DataFrame.")
+        if not count:
+            return pd.DataFrame()
+        # Build each column once with its final dtype instead of letting pandas infer it;
+        # unparseable timestamps become NaT rather than failing the whole conversion
+        return pd.DataFrame({
+            column: (
+                pd.to_datetime(values, format=_THREAD_TIMESTAMP_FORMAT, utc=True, errors="coerce")
+                if column == "timestamp"
+                else pd.array(values, dtype=_THREAD_COLUMN_DTYPES[column])
+            )
+            for column, values in columns.items()
+        })
 
     # ---------------------
     # 11) Fetch Insights for Media in DataFrame
@@ -479,15 +665,32 @@ class ThreadsInsights:
     ) -> List[Dict[str, Any]]:
         """
         Fetch insights for all media IDs in a given DataFrame.
+        Each distinct ID is requested once, in parallel (up to max_concurrency);
+        results keep the DataFrame order, including repeated IDs.
         """
-        insights_list = []
-        for media_id in dataframe["id"]:
-            resp = self.get_media_insights(access_token, media_id, metrics)
+        def fetch(media_id: str) -> Dict[str, Any]:
+            if self._rate_limiter:
+                self._rate_limiter.acquire()
+            return self.get_media_insights(access_token, media_id, metrics)
+
+        unique_ids = dataframe["id"].drop_duplicates().tolist()
+        with ThreadPoolExecutor(max_workers=max(1, self.max_concurrency)) as executor:
+            futures = [executor.submit(fetch, media_id) for media_id in unique_ids]
+
+        results = {}
+        for media_id, future in zip(unique_ids, futures):
+            resp = future.result()
             if "error" in resp:
                 print(f"Error fetching insights for media_id {media_id}: {resp['error']}")
                 continue
-            insights_list.append({"media_id": media_id, "insights": resp})
-        
+            results[media_id] = resp
+
+        insights_list = [
+            {"media_id": media_id, "insights": results[media_id]}
+            for media_id in dataframe["id"]
+            if media_id in results
+        ]
+
         print(f"Fetched insights for {len(insights_list)} media items.")
         return insights_list
 
@@ -498,21 +701,32 @@ class ThreadsInsights:
         """
         Convert the list of insights into a pandas DataFrame with metrics as columns.
         """
-        rows = []
-        for item in insights_list:
-            media_id = item["media_id"]
-            ins_data = item["insights"]
-            if "data" in ins_data:
-                row = {"media_id": media_id}
-                for insight in ins_data["data"]:
-                    metric_name = insight["name"]
-                    if "values" in insight and len(insight["values"]) > 0:
-                        metric_value = insight["values"][0].get("value")
-                        row[metric_name] = metric_value
-                rows.append(row)
-
-        print(f"Converted insights for {len(rows)} media items to DataFrame.")
-        return pd.DataFrame(rows)
+        items = [item for item in insights_list if "data" in item["insights"]]
+
+        # Collect the metric columns first so each column can be filled in place
+        columns = {"media_id": [item["media_id"] for item in items]}
+        for item in items:
+            for insight in item["insights"]["data"]:
+                if insight.get("values") and insight["name"] not in columns:
+                    columns[insight["name"]] = [None] * len(items)
+
+        for row_idx, item in enumerate(items):
+            for insight in item["insights"]["data"]:
+                values = insight.get("values")
+                if values:
+                    columns[insight["name"]][row_idx] = values[0].get("value")
+
+        print(f"Converted insights for {len(items)} media items to DataFrame.")
+        if not items:
+            return pd.DataFrame()
+        # Integer counts use nullable Int64 so missing metrics stay <NA> instead of
+        # turning the column into floats; anything else is left to pandas inference
+        for name, values in columns.items():
+            if name != "media_id" and all(
+                isinstance(v, int) and not isinstance(v, bool) for v in values if v is not None
+            ):
+                columns[name] = pd.array(values, dtype="Int64")
+        return pd.DataFrame(columns)
 
     # ---------------------
     # 13) Fetch & Merge Threads with Insights
@@ -529,21 +743,31 @@ class ThreadsInsights:
         """
         Fetch threads, retrieve insights, and combine into a single DataFrame.
         """
-        print("Fetching threads...")
-        threads_json = self.fetch_all_threads_with_pagination(access_token, fields, since, until)
-        
-        if not threads_json:
-            print("No threads found in the given time frame.")
+        invalid_fields = set(fields) - _THREAD_FIELDS
+        if invalid_fields:
+            error = self._build_error(
+                f"Invalid field(s): {', '.join(sorted(invalid_fields))}. Valid fields: {_THREAD_FIELDS_STR}",
+                code="INVALID_INPUT"
+            )
+            print(f"Error in fetch_and_merge_threads_with_insights: {error['error']}")
             return pd.DataFrame()
 
-        print("Converting threads JSON to DataFrame...")
-        threads_df = self.threads_json_to_dataframe(threads_json)
+        # Only request fields that end up in the DataFrame
+        fields = [f for f in fields if f in _DATAFRAME_FIELDS]
+        if "id" not in fields:
+            fields.insert(0, "id")
+
+        print("Fetching threads into a DataFrame...")
+        threads_df = self.threads_json_to_dataframe(self.iter_all_threads(access_token, fields, since, until))
         if threads_df.empty:
-            print("No valid threads to process.")
+            print("No threads found in the given time frame.")
             return threads_df
 
         print("Fetching insights for threads...")
-        insights_list = self.fetch_insights_for_media_in_dataframe(access_token, threads_df, metrics)
+        # One insights entry per media_id is all the join below needs
+        insights_list = self.fetch_insights_for_media_in_dataframe(
+            access_token, threads_df.drop_duplicates("id"), metrics
+        )
         if not insights_list:
             print("No insights fetched for threads.")
             return threads_df
@@ -555,13 +779,20 @@ class ThreadsInsights:
             return threads_df
 
         print("Merging threads with insights...")
-        combined_df = pd.merge(threads_df, insights_df, left_on="id", right_on="media_id", how="left")
-        combined_df.drop(columns=["media_id"], inplace=True)
-
-        # Insert the 'client' and 'captured_at' columns
+        # The join needs one insights row per media_id (it would multiply repeated ids
+        # otherwise); thread IDs are strings, so match the join key dtype too
+        insights_df = (
+            insights_df.drop_duplicates("media_id")
+            .astype({"media_id": "string"})
+            .set_index("media_id")
+        )
+        combined_df = threads_df.join(insights_df, on="id", how="left").reset_index(drop=True)
+
+        # Add the 'client' and 'captured_at' columns in front
         captured_at_str = datetime.now(timezone.utc).isoformat()
-        combined_df.insert(0, "client", client_name)
-        combined_df.insert(1, "captured_at", captured_at_str)
+        combined_df = combined_df.assign(client=client_name, captured_at=captured_at_str)[
+            ["client", "captured_at", *combined_df.columns]
+        ]
 
         print(f"Final combined DataFrame has {len(combined_df)} rows.")
         return combined_df
\ No newline at end of file